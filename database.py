@@ -5,11 +5,12 @@ MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
 """
 
+from bson import ObjectId
 from pymongo import MongoClient
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
-from typing import Union
+from typing import Optional, Union
 from pydantic import BaseModel
 
 # Load environment variables from .env file
@@ -22,12 +23,13 @@ database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
 if database_url and database_name:
-    _client = MongoClient(database_url)
+    # Pre-populate the pool so the first requests don't pay connection setup
+    _client = MongoClient(database_url, maxPoolSize=100, minPoolSize=10, connect=True, serverSelectionTimeoutMS=3000)
     db = _client[database_name]
 
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
-    """Insert a single document with timestamp"""
+def create_document(collection_name: str, data: Union[BaseModel, dict], document_id: Optional[ObjectId] = None):
+    """Insert a single document with timestamp, optionally under a pre-generated id"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
 
@@ -37,8 +39,12 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
     else:
         data_dict = data.copy()
 
-    data_dict['created_at'] = datetime.now(timezone.utc)
-    data_dict['updated_at'] = datetime.now(timezone.utc)
+    if document_id is not None:
+        data_dict['_id'] = document_id
+
+    now = datetime.now(timezone.utc)
+    data_dict['created_at'] = now
+    data_dict['updated_at'] = now
 
     result = db[collection_name].insert_one(data_dict)
     return str(result.inserted_id)
@@ -53,3 +59,12 @@ def get_documents(collection_name: str, filter_dict: dict = None, limit: int = N
         cursor = cursor.limit(limit)
     
     return list(cursor)
+
+def warmup_connection():
+    """Prime the connection pool and server metadata with trivial queries"""
+    if db is None:
+        return
+
+    db.command("ping")
+    db.user.estimated_document_count()
+    db.list_collection_names()
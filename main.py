@@ -1,24 +1,214 @@
+import asyncio
+import hashlib
+import logging
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone, date
-from typing import Optional, List, Dict, Any
+from time import monotonic, time_ns
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 
-from fastapi import FastAPI, HTTPException
+import httpx
+import orjson
+from bson import ObjectId
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+from pymongo import ReturnDocument
+from starlette.concurrency import run_in_threadpool
 
-from database import db, create_document, get_documents
+from database import db, create_document, warmup_connection
 from schemas import User, JournalEntry, Mantra, OracleConsult, MeditationSession, Lesson, Payment
 
-app = FastAPI(title="WonderLens Chronicles API")
+logger = logging.getLogger(__name__)
 
+UTC = timezone.utc
+
+app = FastAPI(title="WonderLens Chronicles API", default_response_class=ORJSONResponse)
+
+# No cookie auth, so credentials stay off. Only the methods and headers the API
+# uses are allowed, and browsers may cache preflights for max_age seconds.
+# Origins default to "*"; set ALLOWED_ORIGINS (comma-separated) to restrict them.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=[o.strip() for o in os.getenv("ALLOWED_ORIGINS", "*").split(",") if o.strip()],
+    allow_credentials=False,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+OPENAI_RETRY_STATUSES = {429, 500, 502, 503, 504}
+OPENAI_MAX_RETRIES = 3
+# Caps in-flight OpenAI calls per process, streaming included
+OPENAI_SEMAPHORE = asyncio.Semaphore(10)
+
+# Read once at import (after database.py has loaded .env) rather than per request
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_HEADERS = {"Authorization": f"Bearer {OPENAI_API_KEY}", "Content-Type": "application/json"} if OPENAI_API_KEY else None
+
+
+async def openai_chat(http: httpx.AsyncClient, headers: Dict[str, str], body: Dict[str, Any]) -> str:
+    """Post a chat completion and return the stripped message content.
+
+    Rate-limit and transient 5xx responses are retried with exponential backoff;
+    connection errors are retried by the client transport.
+    """
+    for attempt in range(OPENAI_MAX_RETRIES + 1):
+        async with OPENAI_SEMAPHORE:
+            resp = await http.post(OPENAI_CHAT_URL, headers=headers, json=body)
+        if resp.status_code not in OPENAI_RETRY_STATUSES or attempt == OPENAI_MAX_RETRIES:
+            break
+        await asyncio.sleep(0.5 * (2 ** attempt))
+    resp.raise_for_status()
+    choice = resp.json()["choices"][0]
+    if choice.get("finish_reason") == "length" and "response_format" in body:
+        # A JSON reply cut off at max_tokens can't be parsed; treat it as a failed call
+        raise ValueError("Structured completion truncated at max_tokens")
+    return choice["message"]["content"].strip()
+
+
+async def openai_chat_stream(http: httpx.AsyncClient, headers: Dict[str, str], body: Dict[str, Any]) -> AsyncIterator[str]:
+    """Stream a chat completion, yielding content deltas as they arrive.
+
+    Rate-limit and transient 5xx responses are retried like ``openai_chat``;
+    that is only safe before any delta has been yielded, which holds because
+    the status is known before the body is read.
+    """
+    for attempt in range(OPENAI_MAX_RETRIES + 1):
+        async with OPENAI_SEMAPHORE, http.stream("POST", OPENAI_CHAT_URL, headers=headers, json={**body, "stream": True}) as resp:
+            if resp.status_code not in OPENAI_RETRY_STATUSES or attempt == OPENAI_MAX_RETRIES:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[len("data: "):]
+                    if data == "[DONE]":
+                        break
+                    choices = orjson.loads(data).get("choices")
+                    if choices:
+                        delta = choices[0].get("delta", {}).get("content")
+                        if delta:
+                            yield delta
+                return
+        await asyncio.sleep(0.5 * (2 ** attempt))
+
+
+class LRUCache:
+    """Bounded least-recently-used mapping with an optional per-entry TTL.
+
+    Safe to share between the event loop and threadpool handlers. ``pop``
+    bumps the key's generation; a ``set`` carrying an older generation (read
+    before the invalidation) is dropped so it can't re-cache stale data.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = None):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Any, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._generations: "OrderedDict[Any, int]" = OrderedDict()
+        self._next_generation = 0
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def generation(self, key: Any) -> int:
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    def set(self, key: Any, value: Any, generation: Optional[int] = None) -> None:
+        expires_at = monotonic() + self._ttl if self._ttl is not None else None
+        with self._lock:
+            if generation is not None and generation != self._generations.get(key, 0):
+                return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            # Globally increasing so repeated invalidations never reuse a value; the
+            # table is bounded like the data, so a key evicted from it reads as 0 again
+            self._next_generation += 1
+            self._generations[key] = self._next_generation
+            self._generations.move_to_end(key)
+            if len(self._generations) > self._maxsize:
+                self._generations.popitem(last=False)
+
+
+MANTRA_CACHE = LRUCache()
+ORACLE_CACHE = LRUCache()
+# Read caches are per worker process. A journal write only invalidates the cache
+# of the worker that handled it, so journal pages are cached only when this is
+# the sole worker (WEB_CONCURRENCY, as read by uvicorn and set by __main__ below)
+JOURNAL_CACHE: Optional[LRUCache] = LRUCache(ttl=10) if int(os.getenv("WEB_CONCURRENCY", "1")) <= 1 else None
+STATUS_CACHE = LRUCache(maxsize=1, ttl=5)
+
+
+@app.on_event("startup")
+async def open_http_client():
+    # One pooled client per process so OpenAI calls reuse keep-alive connections
+    limits = httpx.Limits(max_keepalive_connections=50, max_connections=100)
+    app.state.http = httpx.AsyncClient(
+        timeout=20,
+        transport=httpx.AsyncHTTPTransport(retries=OPENAI_MAX_RETRIES, limits=limits),
+    )
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await app.state.http.aclose()
+
+
+INDEXES = [
+    ("user", "email", {"unique": True}),
+    # Compound (user_id, sort key) so per-user listings can sort off the index
+    ("journalentry", [("user_id", 1), ("_id", -1)], {}),
+    ("mantra", [("user_id", 1), ("date", -1)], {}),
+    ("oracleconsult", [("user_id", 1)], {}),
+    ("meditationsession", [("user_id", 1), ("started_at", -1)], {}),
+    ("payment", [("user_id", 1), ("reference", 1)], {}),
+]
+
+
+def _ensure_indexes():
+    if db is None:
+        return
+    # One at a time, so a failing index (e.g. duplicate emails) doesn't block the rest
+    for collection, keys, options in INDEXES:
+        try:
+            db[collection].create_index(keys, **options)
+        except Exception as e:
+            logger.warning("Could not create index on %s: %s", collection, e)
+
+
+def _warmup_database():
+    try:
+        warmup_connection()
+    except Exception as e:
+        logger.warning("Database warmup failed: %s", e)
+
+
+@app.on_event("startup")
+async def prepare_database():
+    # Sync startup hooks run on the event loop itself; keep pymongo off it
+    await run_in_threadpool(_ensure_indexes)
+    await run_in_threadpool(_warmup_database)
+
 
 @app.get("/")
 def read_root():
@@ -27,6 +217,10 @@ def read_root():
 
 @app.get("/test")
 def test_database():
+    cached = STATUS_CACHE.get("status")
+    if cached is not None:
+        return cached
+
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -53,6 +247,7 @@ def test_database():
     except Exception as e:
         response["database"] = f"❌ Error: {str(e)[:80]}"
 
+    STATUS_CACHE.set("status", response)
     return response
 
 
@@ -74,8 +269,6 @@ def upsert_user(payload: UpsertUserRequest):
     if db is None:
         raise HTTPException(500, "Database not configured")
 
-    # Try to find by email
-    existing = db.user.find_one({"email": payload.email})
     data = User(
         display_name=payload.display_name,
         email=payload.email,
@@ -85,13 +278,17 @@ def upsert_user(payload: UpsertUserRequest):
         locale=payload.locale or "en",
     ).model_dump()
 
-    if existing:
-        db.user.update_one({"_id": existing["_id"]}, {"$set": {**data, "updated_at": datetime.now(timezone.utc)}})
-        user_id = str(existing["_id"])
-    else:
-        user_id = create_document("user", data)
+    # Single round trip on the unique email index: update if present, insert otherwise
+    now = datetime.now(UTC)
+    doc = db.user.find_one_and_update(
+        {"email": payload.email},
+        {"$set": {**data, "updated_at": now}, "$setOnInsert": {"created_at": now}},
+        projection={"_id": 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
 
-    return {"user_id": user_id, "stage": data["stage"]}
+    return {"user_id": str(doc["_id"]), "stage": data["stage"]}
 
 
 class StageUpdateRequest(BaseModel):
@@ -103,9 +300,8 @@ class StageUpdateRequest(BaseModel):
 def update_stage(req: StageUpdateRequest):
     if db is None:
         raise HTTPException(500, "Database not configured")
-    from bson import ObjectId
     try:
-        db.user.update_one({"_id": ObjectId(req.user_id)}, {"$set": {"stage": req.stage, "updated_at": datetime.now(timezone.utc)}})
+        db.user.update_one({"_id": ObjectId(req.user_id)}, {"$set": {"stage": req.stage, "updated_at": datetime.now(UTC)}})
         return {"ok": True}
     except Exception as e:
         raise HTTPException(400, f"Invalid user or stage: {e}")
@@ -122,42 +318,55 @@ class MantraRequest(BaseModel):
     recent_journal_theme: Optional[str] = None
 
 
-@app.post("/api/mantra/generate")
-def generate_mantra(req: MantraRequest):
-    openai_key = os.getenv("OPENAI_API_KEY")
+MANTRA_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "You are a wise African mystic blending Yoruba, Kikuyu and Kemetian wisdom in gentle, empowering language. "
+        'Return JSON {"mantra": str, "meaning": str}.'
+    ),
+}
+MANTRA_PROMPT_TEMPLATE = (
+    "Create a daily mantra in an African spiritual tone. "
+    "Inputs: mood={mood}, stage={stage}, theme={theme}. "
+    "Output: Short mantra (1–2 lines) and a brief meaning."
+)
+MANTRA_BODY = {"model": "gpt-4o-mini", "temperature": 0.8, "response_format": {"type": "json_object"}}
+# Decode cost scales with tokens; a short or missing theme needs less room
+MANTRA_MAX_TOKENS = 100
+MANTRA_SHORT_THEME_MAX_TOKENS = 80
+MANTRA_SHORT_THEME_CHARS = 24
+
+
+async def _request_mantra(request: Request, req: MantraRequest) -> str:
+    theme = req.recent_journal_theme or ""
+    prompt = MANTRA_PROMPT_TEMPLATE.format(mood=req.user_mood or "", stage=req.user_stage or "", theme=theme)
+    max_tokens = MANTRA_SHORT_THEME_MAX_TOKENS if len(theme) <= MANTRA_SHORT_THEME_CHARS else MANTRA_MAX_TOKENS
+    body = {**MANTRA_BODY, "max_tokens": max_tokens, "messages": [MANTRA_SYSTEM_MESSAGE, {"role": "user", "content": prompt}]}
+    return await openai_chat(request.app.state.http, OPENAI_HEADERS, body)
 
-    base_prompt = (
-        "Create a daily mantra in an African spiritual tone. "
-        "Inputs: mood={mood}, stage={stage}, theme={theme}. "
-        "Output: Short mantra (1–2 lines) then a brief meaning."
-    ).format(mood=req.user_mood or "", stage=req.user_stage or "", theme=req.recent_journal_theme or "")
+
+@app.post("/api/mantra/generate")
+async def generate_mantra(req: MantraRequest, request: Request, background_tasks: BackgroundTasks):
+    if db is None:
+        raise HTTPException(500, "Database not configured")
 
     text = None
     meaning = None
+    today = date.today().isoformat()
 
-    if openai_key:
+    if OPENAI_HEADERS:
         try:
-            import requests
-            headers = {"Authorization": f"Bearer {openai_key}", "Content-Type": "application/json"}
-            body = {
-                "model": "gpt-4o-mini",
-                "messages": [
-                    {"role": "system", "content": "You are a wise African mystic blending Yoruba, Kikuyu and Kemetian wisdom in gentle, empowering language."},
-                    {"role": "user", "content": base_prompt}
-                ],
-                "temperature": 0.8,
-                "max_tokens": 120
-            }
-            resp = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=body, timeout=20)
-            resp.raise_for_status()
-            msg = resp.json()["choices"][0]["message"]["content"].strip()
-            # Simple split: mantra on first line, meaning on second
-            parts = [p.strip("- •\n ") for p in msg.split("\n") if p.strip()]
-            if len(parts) >= 2:
-                text, meaning = parts[0], " ".join(parts[1:])
+            # Keyed by date so a given mood/stage/theme gets a fresh mantra each day
+            cache_key = (req.user_mood, req.user_stage, req.recent_journal_theme, today)
+            cached = MANTRA_CACHE.get(cache_key)
+            if cached is None:
+                parsed = orjson.loads(await _request_mantra(request, req))
+                text = parsed["mantra"].strip()
+                meaning = (parsed.get("meaning") or "").strip() or "A reminder of your inner divinity and alignment with Ashe."
+                # Cache only a reply that parsed, so a bad one is retried next time
+                MANTRA_CACHE.set(cache_key, (text, meaning))
             else:
-                text = msg
-                meaning = "A reminder of your inner divinity and alignment with Ashe."
+                text, meaning = cached
         except Exception:
             text = "I am Divine Flow. Ashe."
             meaning = "Return to breath and remember: your path is guided by ancestors and inner light."
@@ -169,10 +378,11 @@ def generate_mantra(req: MantraRequest):
         text = f"I walk in {theme}, breathing {mood}, embodying {stage}. Ashe."
         meaning = "Let this guide your day with grounded presence and ancestral support."
 
-    today = date.today().isoformat()
     doc = Mantra(user_id=req.user_id, text=text, meaning=meaning, stage=req.user_stage, mood=req.user_mood, journal_theme=req.recent_journal_theme, date=today)
-    mantra_id = create_document("mantra", doc)
-    return {"id": mantra_id, "date": today, "text": text, "meaning": meaning}
+    # Id is generated up front so the insert can run after the response is sent
+    mantra_id = ObjectId()
+    background_tasks.add_task(create_document, "mantra", doc, mantra_id)
+    return {"id": str(mantra_id), "date": today, "text": text, "meaning": meaning}
 
 
 # -----------------------------
@@ -180,49 +390,95 @@ def generate_mantra(req: MantraRequest):
 # -----------------------------
 
 @app.post("/api/journal")
-def create_journal(entry: JournalEntry):
-    entry_id = create_document("journalentry", entry)
-    return {"id": entry_id}
+def create_journal(entry: JournalEntry, background_tasks: BackgroundTasks):
+    if db is None:
+        raise HTTPException(500, "Database not configured")
+
+    entry_id = ObjectId()
+    background_tasks.add_task(_store_journal_entry, entry, entry_id)
+    return {"id": str(entry_id)}
+
+
+def _store_journal_entry(entry: JournalEntry, entry_id: ObjectId):
+    create_document("journalentry", entry, entry_id)
+    # Invalidate after the write; the generation bump also drops any listing
+    # that read the old page before the insert and tries to cache it afterwards
+    if JOURNAL_CACHE is not None:
+        JOURNAL_CACHE.pop(entry.user_id)
 
 
 @app.get("/api/journal/{user_id}")
 def list_journal(user_id: str):
-    items = get_documents("journalentry", {"user_id": user_id}, limit=50)
-    for it in items:
-        it["_id"] = str(it["_id"])
-    return items
+    if db is None:
+        raise HTTPException(500, "Database not configured")
+
+    if JOURNAL_CACHE is None:
+        return Response(content=orjson.dumps(_fetch_journal(user_id)), media_type="application/json")
+
+    cached = JOURNAL_CACHE.get(user_id)
+    if cached is None:
+        # Taken before the read so an insert landing mid-query discards this page
+        generation = JOURNAL_CACHE.generation(user_id)
+        cached = orjson.dumps(_fetch_journal(user_id))
+        JOURNAL_CACHE.set(user_id, cached, generation)
+    return Response(content=cached, media_type="application/json")
+
+
+def _fetch_journal(user_id: str) -> List[Dict[str, Any]]:
+    # Newest first off the (user_id, _id) index; Mongo projects and stringifies _id
+    return list(db.journalentry.aggregate([
+        {"$match": {"user_id": user_id}},
+        {"$sort": {"_id": -1}},
+        {"$limit": 50},
+        {"$project": {
+            "_id": {"$toString": "$_id"},
+            "content": 1,
+            "mood": 1,
+            "theme": 1,
+            "sentiment": 1,
+            "audio_url": 1,
+            "created_at": 1,
+        }},
+    ]))
 
 
 # -----------------------------
 # Oracle (AI or fallback)
 # -----------------------------
 
+ORACLE_SYSTEM_MESSAGE = {"role": "system", "content": "You are The Lens Oracle, compassionate, culturally rooted, clear."}
+ORACLE_PROMPT_PREFIX = (
+    "Interpret this using African spiritual wisdom (Yoruba, Kikuyu, Kemet). "
+    "Explain metaphysical cause and lesson. Input:\n"
+)
+ORACLE_BODY = {"model": "gpt-4o-mini", "temperature": 0.8, "max_tokens": 300}
+
+
+def _oracle_body(user_prompt: str) -> Dict[str, Any]:
+    return {**ORACLE_BODY, "messages": [ORACLE_SYSTEM_MESSAGE, {"role": "user", "content": ORACLE_PROMPT_PREFIX + user_prompt}]}
+
+
+async def _request_oracle(request: Request, user_prompt: str) -> str:
+    return await openai_chat(request.app.state.http, OPENAI_HEADERS, _oracle_body(user_prompt))
+
+
 @app.post("/api/oracle")
-def oracle(consult: OracleConsult):
-    openai_key = os.getenv("OPENAI_API_KEY")
+async def oracle(consult: OracleConsult, request: Request, background_tasks: BackgroundTasks):
+    if db is None:
+        raise HTTPException(500, "Database not configured")
+
     interpretation = None
     refs: List[str] = []
 
-    if openai_key:
+    if OPENAI_HEADERS:
         try:
-            import requests
-            headers = {"Authorization": f"Bearer {openai_key}", "Content-Type": "application/json"}
-            prompt = (
-                "Interpret this using African spiritual wisdom (Yoruba, Kikuyu, Kemet). "
-                "Explain metaphysical cause and lesson. Input:\n" + consult.prompt
-            )
-            body = {
-                "model": "gpt-4o-mini",
-                "messages": [
-                    {"role": "system", "content": "You are The Lens Oracle, compassionate, culturally rooted, clear."},
-                    {"role": "user", "content": prompt},
-                ],
-                "temperature": 0.8,
-                "max_tokens": 300
-            }
-            resp = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=body, timeout=20)
-            resp.raise_for_status()
-            interpretation = resp.json()["choices"][0]["message"]["content"].strip()
+            cache_key = hashlib.sha1(consult.prompt.encode("utf-8")).hexdigest()
+            interpretation = ORACLE_CACHE.get(cache_key)
+            if interpretation is None:
+                interpretation = await _request_oracle(request, consult.prompt)
+                # An empty reply would otherwise be served for this prompt until eviction
+                if interpretation:
+                    ORACLE_CACHE.set(cache_key, interpretation)
             refs = ["Wikipedia: Orishas", "Wikidata: Kemet symbols"]
         except Exception:
             interpretation = "Your dream reflects a call to balance. Honor breath, pour libation (water), and affirm your worth."
@@ -231,9 +487,78 @@ def oracle(consult: OracleConsult):
         interpretation = "This symbol speaks of alignment. Practice heart-centered breath and offer gratitude to ancestors."
         refs = ["Ashe (vital force)", "Ngai (divine source)"]
 
-    doc = OracleConsult(user_id=consult.user_id, prompt=consult.prompt, interpretation=interpretation, references=refs)
-    consult_id = create_document("oracleconsult", doc)
-    return {"id": consult_id, "interpretation": interpretation, "references": refs}
+    # Fields are server-generated, so copy rather than re-validate a new model
+    doc = consult.model_copy(update={"interpretation": interpretation, "references": refs})
+    consult_id = ObjectId()
+    background_tasks.add_task(create_document, "oracleconsult", doc, consult_id)
+    return {"id": str(consult_id), "interpretation": interpretation, "references": refs}
+
+
+def _sse(payload: Any) -> bytes:
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+def _store_streamed_consult(consult: OracleConsult, consult_id: ObjectId, cache_key: str, result: Dict[str, Any]):
+    if not result.get("complete"):
+        return
+    if result["from_openai"] and result["interpretation"]:
+        ORACLE_CACHE.set(cache_key, result["interpretation"])
+    doc = consult.model_copy(update={"interpretation": result["interpretation"], "references": result["references"]})
+    create_document("oracleconsult", doc, consult_id)
+
+
+@app.post("/api/oracle/stream")
+async def oracle_stream(consult: OracleConsult, request: Request, background_tasks: BackgroundTasks):
+    """Server-sent events variant of /api/oracle.
+
+    Emits ``{"token": ...}`` events as the interpretation is generated, then
+    ``{"id": ..., "references": [...]}`` and ``[DONE]``. If OpenAI fails after tokens
+    were sent, ``{"error": "interrupted"}`` precedes ``[DONE]`` and nothing is
+    stored. Otherwise the consult is stored once the stream has been sent.
+    """
+    if db is None:
+        raise HTTPException(500, "Database not configured")
+
+    cache_key = hashlib.sha1(consult.prompt.encode("utf-8")).hexdigest()
+    consult_id = ObjectId()
+    result: Dict[str, Any] = {"complete": False, "from_openai": False}
+
+    async def events():
+        chunks: List[str] = []
+        refs = ["Wikipedia: Orishas", "Wikidata: Kemet symbols"]
+        cached = ORACLE_CACHE.get(cache_key) if OPENAI_HEADERS else None
+
+        if cached is not None:
+            chunks.append(cached)
+            yield _sse({"token": cached})
+        elif OPENAI_HEADERS:
+            try:
+                async for token in openai_chat_stream(request.app.state.http, OPENAI_HEADERS, _oracle_body(consult.prompt)):
+                    chunks.append(token)
+                    yield _sse({"token": token})
+                result["from_openai"] = True
+            except Exception:
+                if chunks:
+                    # Partial interpretation already sent; flag it so clients don't take it as complete
+                    yield _sse({"error": "interrupted"})
+                    yield b"data: [DONE]\n\n"
+                    return
+                fallback = "Your dream reflects a call to balance. Honor breath, pour libation (water), and affirm your worth."
+                chunks.append(fallback)
+                refs = ["Proverb: A river that forgets its source will dry up."]
+                yield _sse({"token": fallback})
+        else:
+            fallback = "This symbol speaks of alignment. Practice heart-centered breath and offer gratitude to ancestors."
+            chunks.append(fallback)
+            refs = ["Ashe (vital force)", "Ngai (divine source)"]
+            yield _sse({"token": fallback})
+
+        yield _sse({"id": str(consult_id), "references": refs})
+        yield b"data: [DONE]\n\n"
+        result.update(complete=True, interpretation="".join(chunks).strip(), references=refs)
+
+    background_tasks.add_task(_store_streamed_consult, consult, consult_id, cache_key, result)
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 # -----------------------------
@@ -241,10 +566,14 @@ def oracle(consult: OracleConsult):
 # -----------------------------
 
 @app.post("/api/meditation/start")
-def start_meditation(sess: MeditationSession):
-    sess.started_at = datetime.now(timezone.utc)
-    sess_id = create_document("meditationsession", sess)
-    return {"id": sess_id, "started_at": sess.started_at}
+def start_meditation(sess: MeditationSession, background_tasks: BackgroundTasks):
+    if db is None:
+        raise HTTPException(500, "Database not configured")
+
+    sess.started_at = datetime.now(UTC)
+    sess_id = ObjectId()
+    background_tasks.add_task(create_document, "meditationsession", sess, sess_id)
+    return {"id": str(sess_id), "started_at": sess.started_at}
 
 
 # -----------------------------
@@ -258,9 +587,13 @@ LESSONS: List[Lesson] = [
 ]
 
 
+# Static seed, so serialize once at import and serve the bytes as-is
+LESSONS_JSON: bytes = orjson.dumps([l.model_dump() for l in LESSONS])
+
+
 @app.get("/api/lessons")
 def get_lessons():
-    return [l.model_dump() for l in LESSONS]
+    return Response(content=LESSONS_JSON, media_type="application/json")
 
 
 # -----------------------------
@@ -275,14 +608,22 @@ class PaymentIntentRequest(BaseModel):
 
 
 @app.post("/api/payments/intent")
-def create_payment_intent(req: PaymentIntentRequest):
+def create_payment_intent(req: PaymentIntentRequest, background_tasks: BackgroundTasks):
+    if db is None:
+        raise HTTPException(500, "Database not configured")
+
     # In a real integration, call Stripe/M-Pesa/PayPal SDKs here.
-    payment = Payment(user_id=req.user_id, provider=req.provider, amount_cents=req.amount_cents, currency=req.currency, status="pending", reference=f"SIM-{int(datetime.now().timestamp())}")
-    pid = create_document("payment", payment)
-    return {"id": pid, "reference": payment.reference, "status": payment.status}
+    payment = Payment(user_id=req.user_id, provider=req.provider, amount_cents=req.amount_cents, currency=req.currency, status="pending", reference=f"SIM-{time_ns() // 1_000_000_000}")
+    pid = ObjectId()
+    background_tasks.add_task(create_document, "payment", payment, pid)
+    return {"id": str(pid), "reference": payment.reference, "status": payment.status}
 
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2))
+    # Exported so each spawned worker knows it isn't alone when importing main
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    # Import string form is required for uvicorn to spawn worker processes
+    uvicorn.run("main:app", host="0.0.0.0", port=port, workers=workers, loop="uvloop", http="httptools")